@@ -1,130 +1,43 @@
 import sys
 import os
-import webbrowser
 import shutil
-import tempfile
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QPushButton,
-    QFileDialog, QVBoxLayout, QLabel, QTextEdit, QHBoxLayout
-)
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QFont, QColor
+import webbrowser
+from PyQt5.QtWidgets import QApplication, QFileDialog
+from PyQt5.QtCore import QFileSystemWatcher
 import open3d as o3d
 
+from _mesh_gui_base import MeshGUIBase
+from _mesh_io import (
+    is_remote_path, staged_copy, fast_copy,
+    load_cached_mesh, store_cached_mesh, deduplicate_vertices
+)
+
+
+class MeshGUI(MeshGUIBase):
+    window_title = "Mesh Reconstructing"
 
-class MeshGUI(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.setWindowFlags(Qt.FramelessWindowHint)  # Frameless window
-        self.setGeometry(100, 100, 1000, 700)
-
-        # Track mouse position for dragging the window
-        self.old_pos = None
-
-        # Central Widget
-        self.central_widget = QWidget()
-        self.central_widget.setStyleSheet("background-color: #2E3440;")
-        self.setCentralWidget(self.central_widget)
-
-        # Main layout
-        self.layout = QVBoxLayout()
-        self.layout.setSpacing(15)
-        self.central_widget.setLayout(self.layout)
-
-        # Custom title bar
-        self.title_bar = QWidget()
-        self.title_bar.setStyleSheet("background-color: #4C566A;")
-        self.title_layout = QHBoxLayout()
-        self.title_layout.setContentsMargins(0, 0, 0, 0)
-        self.title_bar.setLayout(self.title_layout)
-
-        # Title label centered
-        self.title_label = QLabel("Mesh Reconstructing")
-        self.title_label.setAlignment(Qt.AlignCenter)
-        self.title_label.setFont(QFont("Arial", 20, QFont.Bold))
-        self.title_label.setStyleSheet("color: white; padding: 10px;")
-        self.title_layout.addWidget(self.title_label)
-
-        # Close button
-        self.close_button = QPushButton("X")
-        self.close_button.setFixedSize(40, 30)
-        self.close_button.setStyleSheet("""
-            QPushButton {
-                background-color: #BF616A; 
-                color: white; 
-                font-weight: bold; 
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #D08770;
-            }
-        """)
-        self.close_button.clicked.connect(self.close)
-        self.title_layout.addWidget(self.close_button)
-
-        self.layout.addWidget(self.title_bar)
-
-        # Button styling
-        button_style = """
-            QPushButton {
-                background-color: #5E81AC;
-                color: white;
-                font-size: 16px;
-                padding: 10px;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #81A1C1;
-            }
-        """
 
+        # Rigged FBX files downloaded from Mixamo are picked up from here and
+        # copied into the Unity Assets folder chosen by the user
+        self.downloads_dir = os.path.join(os.path.expanduser("~"), "Downloads")
+        self.unity_assets_path = None
+        self._seen_downloads = set()
+        self.download_watcher = QFileSystemWatcher(self)
+        self.download_watcher.directoryChanged.connect(self.check_downloads)
+
+    def _add_action_buttons(self, layout):
         # Load mesh button
-        self.load_button = QPushButton("Load Mesh (.obj/.fbx)")
-        self.load_button.setStyleSheet(button_style)
-        self.load_button.clicked.connect(self.load_mesh)
-        self.layout.addWidget(self.load_button)
+        self.load_button = self._add_button(
+            layout, "Load Mesh (.obj/.fbx)", self.load_mesh)
 
         # Rig in Mixamo
-        self.rig_button = QPushButton("Rig in Mixamo")
-        self.rig_button.setStyleSheet(button_style)
-        self.rig_button.clicked.connect(self.open_mixamo)
-        self.layout.addWidget(self.rig_button)
+        self.rig_button = self._add_button(layout, "Rig in Mixamo", self.open_mixamo)
 
         # Import rigged FBX to Unity
-        self.import_button = QPushButton("Import Rigged FBX to Unity")
-        self.import_button.setStyleSheet(button_style)
-        self.import_button.clicked.connect(self.import_to_unity)
-        self.layout.addWidget(self.import_button)
-
-        # Status log
-        self.status_log = QTextEdit()
-        self.status_log.setReadOnly(True)
-        self.status_log.setStyleSheet(
-            "background-color: #3B4252; color: #ECEFF4; font-size: 14px; border-radius: 5px; padding: 5px;"
-        )
-        self.layout.addWidget(self.status_log)
-
-        # Mesh holder
-        self.mesh = None
-        self.mesh_file = None
-
-    # Make frameless window draggable
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.old_pos = event.globalPos()
-
-    def mouseMoveEvent(self, event):
-        if self.old_pos:
-            delta = QPoint(event.globalPos() - self.old_pos)
-            self.move(self.x() + delta.x(), self.y() + delta.y())
-            self.old_pos = event.globalPos()
-
-    def mouseReleaseEvent(self, event):
-        self.old_pos = None
-
-    def log(self, message):
-        self.status_log.append(message)
-        print(message)
+        self.import_button = self._add_button(
+            layout, "Import Rigged FBX to Unity", self.import_to_unity)
 
     # Load OBJ or FBX
     def load_mesh(self):
@@ -134,24 +47,47 @@ class MeshGUI(QMainWindow):
         if file_name:
             self.mesh_file = file_name
             try:
-                self.mesh = o3d.io.read_triangle_mesh(file_name)
+                self.mesh = self._cached_load(file_name)
                 if self.mesh.has_textures():
                     self.log(f"Loaded mesh with textures: {file_name}")
                 else:
                     self.log(f"Loaded mesh without textures: {file_name}")
 
-                # Open3D visualizer in non-blocking mode
+                # draw_geometries blocks, so show the log before opening it
+                self.flush_log()
                 self.visualize_mesh(self.mesh)
 
             except Exception as e:
                 self.log(f"Error loading mesh: {str(e)}")
 
+    def _cached_load(self, file_name):
+        """Read a mesh, reusing the binary cache entry if the file is unchanged"""
+        mesh = load_cached_mesh(file_name)
+        if mesh is not None:
+            self.log("Using cached copy of unchanged mesh")
+            return mesh
+
+        if is_remote_path(file_name):
+            # One sequential copy instead of many small network reads
+            self.log("Mesh is on a network drive, copying it locally first...")
+            with staged_copy(file_name) as local_file:
+                mesh = o3d.io.read_triangle_mesh(local_file)
+        else:
+            mesh = o3d.io.read_triangle_mesh(file_name)
+
+        # Merge seam-duplicated OBJ vertices, as the OBJ viewer does
+        if file_name.lower().endswith(".obj"):
+            deduplicate_vertices(mesh)
+
+        if mesh.has_vertices():
+            try:
+                store_cached_mesh(file_name, mesh)
+            except Exception as e:
+                self.log(f"Warning: Could not cache mesh: {e}")
+        return mesh
+
     def visualize_mesh(self, mesh):
-        tmp_dir = tempfile.gettempdir()
-        tmp_file = os.path.join(tmp_dir, "tmp_mesh.ply")
-        o3d.io.write_triangle_mesh(tmp_file, mesh)
-        mesh_tmp = o3d.io.read_triangle_mesh(tmp_file)
-        o3d.visualization.draw_geometries([mesh_tmp])
+        o3d.visualization.draw_geometries([mesh])
 
     # Open Mixamo website
     def open_mixamo(self):
@@ -159,25 +95,83 @@ class MeshGUI(QMainWindow):
         self.log(
             "Opened Mixamo in your default browser. Upload your mesh and download rigged FBX.")
 
+        # Mixamo has no public API, so pick the rigged FBX up from Downloads
+        if os.path.isdir(self.downloads_dir) and not self.download_watcher.directories():
+            # Ask now rather than from the watcher slot, where a modal dialog
+            # would let further directoryChanged signals in
+            if not self.unity_assets_path:
+                self.unity_assets_path = QFileDialog.getExistingDirectory(
+                    self, "Select Unity Assets Folder"
+                )
+                if not self.unity_assets_path:
+                    self.log("No Unity Assets folder selected, not watching Downloads.")
+                    return
+            self._seen_downloads = self.list_fbx_files(self.downloads_dir)
+            self.download_watcher.addPath(self.downloads_dir)
+            self.log(
+                f"Watching {self.downloads_dir} - the rigged FBX will be copied to Unity automatically.")
+
+    def stop_watching_downloads(self):
+        directories = self.download_watcher.directories()
+        if directories:
+            self.download_watcher.removePaths(directories)
+
+    def closeEvent(self, event):
+        self.stop_watching_downloads()
+        super().closeEvent(event)
+
+    @staticmethod
+    def list_fbx_files(directory):
+        try:
+            return {name for name in os.listdir(directory)
+                    if name.lower().endswith(".fbx")}
+        except OSError:
+            return set()
+
+    def check_downloads(self, directory):
+        for name in sorted(self.list_fbx_files(directory) - self._seen_downloads):
+            file_name = os.path.join(directory, name)
+            # Browsers may create the final file name before the download completes
+            try:
+                if (os.path.getsize(file_name) == 0
+                        or os.path.exists(file_name + ".part")
+                        or os.path.exists(file_name + ".crdownload")):
+                    continue
+            except OSError:
+                continue
+            self._seen_downloads.add(name)
+            self.log(f"Rigged FBX downloaded: {name}")
+            # Only the Mixamo download is wanted, not every later FBX
+            self.stop_watching_downloads()
+            self.copy_to_unity(file_name)
+            break
+
     # Copy downloaded FBX to Unity Assets
     def import_to_unity(self):
         file_name, _ = QFileDialog.getOpenFileName(
             self, "Select Rigged FBX", "", "FBX Files (*.fbx)"
         )
         if file_name:
-            try:
-                unity_assets_path = QFileDialog.getExistingDirectory(
-                    self, "Select Unity Assets Folder"
-                )
-                if unity_assets_path:
-                    base_name = os.path.basename(file_name)
-                    target_path = os.path.join(unity_assets_path, base_name)
-                    os.makedirs(unity_assets_path, exist_ok=True)
-                    shutil.copy(file_name, target_path)
-                    self.log(
-                        f"Copied rigged FBX to Unity Assets: {target_path}")
-            except Exception as e:
-                self.log(f"Error copying FBX: {str(e)}")
+            unity_assets_path = QFileDialog.getExistingDirectory(
+                self, "Select Unity Assets Folder"
+            )
+            if unity_assets_path:
+                self.unity_assets_path = unity_assets_path
+                self.copy_to_unity(file_name)
+
+    # Callers choose self.unity_assets_path before copying
+    def copy_to_unity(self, file_name):
+        try:
+            base_name = os.path.basename(file_name)
+            target_path = os.path.join(self.unity_assets_path, base_name)
+            os.makedirs(self.unity_assets_path, exist_ok=True)
+            fast_copy(file_name, target_path)
+            self.log(
+                f"Copied rigged FBX to Unity Assets: {target_path}")
+        except shutil.SameFileError:
+            self.log(f"Rigged FBX is already in Unity Assets: {file_name}")
+        except Exception as e:
+            self.log(f"Error copying FBX: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+import threading
+import functools
+from PyQt5.QtWidgets import (
+    QMainWindow, QWidget, QPushButton, QVBoxLayout, QLabel, QTextEdit, QHBoxLayout
+)
+from PyQt5.QtCore import Qt, QPoint, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont
+
+
+# Stylesheets shared by every window; Qt resolves each one only once
+CENTRAL_WIDGET_STYLE = "background-color: #2E3440;"
+TITLE_BAR_STYLE = "background-color: #4C566A;"
+TITLE_LABEL_STYLE = "color: white; padding: 10px;"
+CLOSE_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #BF616A;
+        color: white;
+        font-weight: bold;
+        border-radius: 5px;
+    }
+    QPushButton:hover {
+        background-color: #D08770;
+    }
+"""
+BUTTON_STYLE = """
+    QPushButton {
+        background-color: #5E81AC;
+        color: white;
+        font-size: 16px;
+        padding: 10px;
+        border-radius: 8px;
+    }
+    QPushButton:hover {
+        background-color: #81A1C1;
+    }
+"""
+STATUS_LOG_STYLE = (
+    "background-color: #3B4252; color: #ECEFF4; font-size: 14px; border-radius: 5px; padding: 5px;"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def title_font():
+    # Created on first use, since QFont needs a running QApplication
+    return QFont("Arial", 20, QFont.Bold)
+
+
+class MeshGUIBase(QMainWindow):
+    """Frameless main window with a title bar and a status log
+
+    Subclasses set window_title and add their buttons in _add_action_buttons().
+    """
+    window_title = "Mesh Reconstructing"
+
+    # Emitted when the first line of a new log batch is buffered
+    log_pending = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowFlags(Qt.FramelessWindowHint)  # Frameless window
+        self.setGeometry(100, 100, 1000, 700)
+
+        # Track mouse position for dragging the window
+        self.old_pos = None
+
+        # Central Widget
+        self.central_widget = QWidget()
+        self.central_widget.setStyleSheet(CENTRAL_WIDGET_STYLE)
+        self.setCentralWidget(self.central_widget)
+
+        # Main layout
+        self.layout = QVBoxLayout()
+        self.layout.setSpacing(15)
+        self.central_widget.setLayout(self.layout)
+
+        # Custom title bar
+        self.title_bar = QWidget()
+        self.title_bar.setStyleSheet(TITLE_BAR_STYLE)
+        self.title_layout = QHBoxLayout()
+        self.title_layout.setContentsMargins(0, 0, 0, 0)
+        self.title_bar.setLayout(self.title_layout)
+
+        # Title label centered
+        self.title_label = QLabel(self.window_title)
+        self.title_label.setAlignment(Qt.AlignCenter)
+        self.title_label.setFont(title_font())
+        self.title_label.setStyleSheet(TITLE_LABEL_STYLE)
+        self.title_layout.addWidget(self.title_label)
+
+        # Close button
+        self.close_button = QPushButton("X")
+        self.close_button.setFixedSize(40, 30)
+        self.close_button.setStyleSheet(CLOSE_BUTTON_STYLE)
+        self.close_button.clicked.connect(self.close)
+        self.title_layout.addWidget(self.close_button)
+
+        self.layout.addWidget(self.title_bar)
+
+        # Tool-specific buttons
+        self._add_action_buttons(self.layout)
+
+        # Status log; lines are buffered and appended in batches. log() may
+        # be called from loader threads, so the buffer is lock-protected
+        # and the widget is only updated on the GUI thread.
+        self._log_buf = []
+        self._log_lock = threading.Lock()
+        self.log_pending.connect(self._schedule_log_flush, Qt.QueuedConnection)
+        self.status_log = QTextEdit()
+        self.status_log.setReadOnly(True)
+        self.status_log.setStyleSheet(STATUS_LOG_STYLE)
+        self.layout.addWidget(self.status_log)
+
+        # Mesh holder
+        self.mesh = None
+        self.mesh_file = None
+
+    def _add_action_buttons(self, layout):
+        """Add the window's action buttons to layout; overridden by subclasses"""
+
+    def _add_button(self, layout, text, slot):
+        button = QPushButton(text)
+        button.setStyleSheet(BUTTON_STYLE)
+        button.clicked.connect(slot)
+        layout.addWidget(button)
+        return button
+
+    # Make frameless window draggable
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.old_pos = event.globalPos()
+
+    def mouseMoveEvent(self, event):
+        if self.old_pos:
+            delta = QPoint(event.globalPos() - self.old_pos)
+            self.move(self.x() + delta.x(), self.y() + delta.y())
+            self.old_pos = event.globalPos()
+
+    def mouseReleaseEvent(self, event):
+        self.old_pos = None
+
+    def log(self, message):
+        print(message)
+        with self._log_lock:
+            self._log_buf.append(message)
+            first_pending = len(self._log_buf) == 1
+        if first_pending:
+            self.log_pending.emit()
+
+    def _schedule_log_flush(self):
+        # Collect everything logged in the next 50 ms into one update
+        QTimer.singleShot(50, self.flush_log)
+
+    def flush_log(self):
+        """Append all buffered log lines to the status log in one update"""
+        with self._log_lock:
+            lines, self._log_buf = self._log_buf, []
+        if lines:
+            self.status_log.append('\n'.join(lines))
@@ -0,0 +1,448 @@
+import os
+import re
+import sys
+import shutil
+import hashlib
+import tempfile
+import functools
+import contextlib
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import open3d as o3d
+
+
+# Large sequential reads so a mesh on a network share is fetched in one pass
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Texture extensions in the order they are tried when resolving a reference
+TEXTURE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tga')
+
+# Linux filesystem types where every small read pays a network round trip
+REMOTE_FS_TYPES = {'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'beegfs', 'lustre',
+                   'gpfs', 'ceph', 'glusterfs', '9p', 'fuse.sshfs'}
+
+# OBJ header lines are matched as bytes, MTL files as text
+_MTLLIB_RE = re.compile(rb'^[ \t]*mtllib[ \t]+(\S.*?)\s*$', re.M)
+# Skips option flags such as "-clamp on", "-imfchan r" or "-s 1 1 1" before
+# the file name
+_MAPKD_OPTION_VALUE = r'(?:on|off|[rgbmlz]|[-+]?[\d.]+)'
+_MAPKD_RE = re.compile(
+    r'^[ \t]*map_Kd[ \t]+(?:-\w+(?:[ \t]+' + _MAPKD_OPTION_VALUE + r')*[ \t]+)*'
+    r'(\S.*?)[ \t]*$', re.M)
+# What is left when a map_Kd line has options but no file name
+_MAPKD_OPTION_VALUE_RE = re.compile(_MAPKD_OPTION_VALUE)
+# mtllib must precede these, so the OBJ scan stops at the first one
+_OBJ_GEOMETRY_PREFIXES = (b'v ', b'vt ', b'vn ', b'f ')
+
+DRIVE_REMOTE = 4
+FILE_ATTRIBUTE_TEMPORARY = 0x100
+
+# RAM-backed directory on Linux; staged copies there never touch the disk
+SHM_DIR = '/dev/shm'
+
+# Parsed meshes are kept here in binary form, one entry per source file
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'mesh_reconstructing')
+# Entries hold uncompressed textures, so the least recently used ones are
+# removed once the cache grows past this size
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# TriangleMesh buffers stored in the cache and the Open3D vector type of each
+_CACHED_MESH_FIELDS = (
+    ('vertices', o3d.utility.Vector3dVector),
+    ('triangles', o3d.utility.Vector3iVector),
+    ('vertex_normals', o3d.utility.Vector3dVector),
+    ('vertex_colors', o3d.utility.Vector3dVector),
+    ('triangle_uvs', o3d.utility.Vector2dVector),
+    ('triangle_material_ids', o3d.utility.IntVector),
+)
+
+
+def scan_obj_header(obj_path):
+    """Return the material libraries named in the header of an OBJ file
+
+    Only the lines before the first vertex or face are read, so the cost
+    does not grow with the size of the mesh.
+    """
+    mtl_files = []
+    with open(obj_path, 'rb') as f:
+        for line in f:
+            if line.startswith(_OBJ_GEOMETRY_PREFIXES):
+                break
+            match = _MTLLIB_RE.match(line)
+            if match:
+                mtl_files.append(match.group(1).decode('utf-8', 'ignore'))
+    return mtl_files
+
+
+def scan_mtl_textures(mtl_path):
+    """Return the diffuse texture maps (map_Kd) referenced by an MTL file"""
+    mtl_text = Path(mtl_path).read_text(encoding='utf-8', errors='ignore')
+    return [texture_file for texture_file in _MAPKD_RE.findall(mtl_text)
+            if not _MAPKD_OPTION_VALUE_RE.fullmatch(texture_file)]
+
+
+@dataclass
+class MeshSoA:
+    """Per-attribute numpy arrays for an Open3D TriangleMesh
+
+    from_mesh() returns views onto the mesh's own buffers, so nothing is
+    copied until the arrays are written back with to_mesh(). Optional
+    attributes the mesh does not have are None.
+    """
+    positions: np.ndarray
+    normals: Optional[np.ndarray]
+    triangles: np.ndarray
+    uvs: Optional[np.ndarray] = None
+    colors: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        return cls(
+            positions=np.asarray(mesh.vertices),
+            normals=np.asarray(mesh.vertex_normals) if mesh.has_vertex_normals() else None,
+            triangles=np.asarray(mesh.triangles),
+            uvs=np.asarray(mesh.triangle_uvs) if mesh.has_triangle_uvs() else None,
+            colors=np.asarray(mesh.vertex_colors) if mesh.has_vertex_colors() else None,
+        )
+
+    def to_mesh(self, mesh):
+        """Write the arrays into mesh, wrapping each buffer once
+
+        Attributes that are None are left as they are on the mesh.
+        """
+        mesh.vertices = o3d.utility.Vector3dVector(self.positions)
+        mesh.triangles = o3d.utility.Vector3iVector(
+            self.triangles.astype(np.int32, copy=False))
+        if self.normals is not None:
+            mesh.vertex_normals = o3d.utility.Vector3dVector(self.normals)
+        if self.uvs is not None:
+            mesh.triangle_uvs = o3d.utility.Vector2dVector(self.uvs)
+        if self.colors is not None:
+            mesh.vertex_colors = o3d.utility.Vector3dVector(self.colors)
+        return mesh
+
+
+def deduplicate_vertices(mesh):
+    """Merge vertices with identical positions, e.g. copies split along UV seams
+
+    Positions are compared as raw float32 bytes and grouped with np.unique,
+    so there is no per-vertex Python work. The merged vertices come out
+    sorted by that byte key rather than in file order, so vertex indices
+    no longer match the source file. Triangle UVs are stored per
+    triangle corner and are not affected. The mesh is modified in place.
+    """
+    soa = MeshSoA.from_mesh(mesh)
+    if len(soa.positions) == 0:
+        return mesh
+
+    keys = np.ascontiguousarray(soa.positions, dtype='<f4').view('S12').ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    if len(first) == len(soa.positions):
+        return mesh
+
+    # Per-vertex attributes keep the first copy; UVs are left untouched
+    deduplicated = MeshSoA(
+        positions=soa.positions[first],
+        normals=soa.normals[first] if soa.normals is not None else None,
+        triangles=inverse.ravel().astype(np.int32)[soa.triangles],
+        colors=soa.colors[first] if soa.colors is not None else None,
+    )
+    return deduplicated.to_mesh(mesh)
+
+
+def _remote_mount_points():
+    """Return the mount points of network filesystems listed in /proc/mounts"""
+    mount_points = []
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[2] in REMOTE_FS_TYPES:
+                    # Spaces and tabs in mount points are octal-escaped
+                    mount_points.append(re.sub(
+                        r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[1]))
+    except OSError:
+        pass
+    return mount_points
+
+
+def is_remote_path(path):
+    """Check whether path lives on a network share rather than a local disk"""
+    path = os.path.abspath(path)
+
+    if sys.platform == 'win32':
+        if path.startswith('\\\\?\\'):
+            path = path[4:]
+            if path.upper().startswith('UNC\\'):
+                return True
+        elif path.startswith('\\\\'):
+            return True
+        drive = os.path.splitdrive(path)[0]
+        if not drive:
+            return False
+        try:
+            import ctypes
+            return ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == DRIVE_REMOTE
+        except Exception:
+            return False
+
+    path = os.path.realpath(path)
+    for mount_point in _remote_mount_points():
+        if path == mount_point or path.startswith(mount_point.rstrip('/') + '/'):
+            return True
+    return False
+
+
+def staging_dir(required_bytes):
+    """Pick the parent directory for short-lived local copies of required_bytes
+
+    Returns SHM_DIR when it is writable and has room to spare, otherwise
+    None so tempfile falls back to its default location.
+    """
+    if not (os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK)):
+        return None
+    try:
+        # Keep as much again free, since SHM_DIR is backed by memory
+        if shutil.disk_usage(SHM_DIR).free < 2 * required_bytes:
+            return None
+    except OSError:
+        return None
+    return SHM_DIR
+
+
+def _mark_temporary(path):
+    """Ask Windows to keep path in the cache instead of writing it back to disk"""
+    if sys.platform != 'win32':
+        return
+    try:
+        import ctypes
+        ctypes.windll.kernel32.SetFileAttributesW(path, FILE_ATTRIBUTE_TEMPORARY)
+    except Exception:
+        pass
+
+
+def mesh_companion_files(mesh_path):
+    """List the files mesh_path references as absolute paths
+
+    For an OBJ these are its material libraries and the textures they
+    name; for an FBX, the files in its <name>.fbm texture folder.
+    References that do not resolve to a file are left out.
+    """
+    mesh_dir = os.path.dirname(os.path.abspath(mesh_path))
+    paths = []
+
+    def add(path):
+        path = os.path.abspath(path)
+        if path not in paths:
+            paths.append(path)
+
+    extension = os.path.splitext(mesh_path)[1].lower()
+    if extension == '.obj':
+        for mtl_file in scan_obj_header(mesh_path):
+            mtl_path = os.path.join(mesh_dir, mtl_file)
+            if not os.path.isfile(mtl_path):
+                continue
+            add(mtl_path)
+            for texture_ref in scan_mtl_textures(mtl_path):
+                texture_path = find_texture_file(mesh_dir, texture_ref)
+                if texture_path:
+                    add(texture_path)
+    elif extension == '.fbx':
+        fbm_dir = os.path.splitext(mesh_path)[0] + '.fbm'
+        for root, _, names in os.walk(fbm_dir):
+            for name in names:
+                add(os.path.join(root, name))
+    return paths
+
+
+def copy_mesh_files(source_dir, target_dir, rel_paths):
+    """Copy rel_paths from source_dir into target_dir
+
+    The relative layout is kept, so references like "textures/skin.png"
+    or "../mat/skin.mtl" still resolve from the copies.
+    """
+    for rel_path in rel_paths:
+        target_path = os.path.join(target_dir, rel_path)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        with open(os.path.join(source_dir, rel_path), 'rb') as src, \
+                open(target_path, 'wb') as dst:
+            _mark_temporary(target_path)
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+@contextlib.contextmanager
+def staged_copy(mesh_path):
+    """Copy a mesh and the files it references to a local temporary directory
+
+    Yields the path of the local mesh; the copies are removed on exit.
+    The files are copied from the deepest folder that contains all of
+    them. If there is none (files on different Windows drives), mesh_path
+    itself is yielded and the mesh is loaded in place.
+    """
+    paths = [os.path.abspath(mesh_path)] + mesh_companion_files(mesh_path)
+    try:
+        source_dir = os.path.commonpath([os.path.dirname(path) for path in paths])
+    except ValueError:
+        source_dir = None
+
+    if source_dir is None:
+        yield mesh_path
+        return
+
+    rel_paths = [os.path.relpath(path, source_dir) for path in paths]
+    total_size = sum(os.path.getsize(path) for path in paths)
+    with tempfile.TemporaryDirectory(dir=staging_dir(total_size)) as tmp_dir:
+        copy_mesh_files(source_dir, tmp_dir, rel_paths)
+        yield os.path.join(tmp_dir, rel_paths[0])
+
+
+def fast_copy(src, dst):
+    """Copy src to dst, letting the OS move the bytes where it can
+
+    Uses CopyFileW on Windows (server-side copy on SMB/ReFS) and
+    shutil.copyfile elsewhere, which already uses sendfile/fcopyfile.
+    Raises shutil.SameFileError if src and dst are the same file.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            if ctypes.windll.kernel32.CopyFileW(src, dst, False):
+                return
+        except Exception:
+            pass
+    shutil.copyfile(src, dst)
+
+
+@functools.lru_cache(maxsize=32)
+def _list_dir(obj_dir, mtime_ns):
+    """Map lower-cased names of the entries in obj_dir to their on-disk names
+
+    mtime_ns is part of the cache key, so a directory that gained or lost
+    files since it was last listed is listed again.
+    """
+    try:
+        return {name.lower(): name for name in os.listdir(obj_dir or '.')}
+    except OSError:
+        return {}
+
+
+def _find_in_dir(directory, texture_name):
+    """Look texture_name up in directory, trying the other image extensions"""
+    try:
+        entries = _list_dir(directory, os.stat(directory or '.').st_mtime_ns)
+    except OSError:
+        return None
+    name = texture_name.lower()
+    base = os.path.splitext(name)[0]
+    for candidate in (name,) + tuple(base + ext for ext in TEXTURE_EXTENSIONS):
+        if candidate in entries:
+            return os.path.join(directory, entries[candidate])
+    return None
+
+
+def find_texture_file(obj_dir, texture_ref):
+    """Resolve a texture reference from an MTL file to a file in obj_dir
+
+    Names are matched case-insensitively against a cached listing of
+    the directory; if the exact name is missing, the common image
+    extensions are tried in TEXTURE_EXTENSIONS order.
+    """
+    texture_name = os.path.basename(texture_ref)
+
+    # References into a sub-directory are looked up there first
+    ref_dir = os.path.dirname(texture_ref)
+    if ref_dir:
+        found = _find_in_dir(os.path.join(obj_dir, ref_dir), texture_name)
+        if found:
+            return found
+
+    return _find_in_dir(obj_dir, texture_name)
+
+
+def _cache_entry(mesh_path):
+    """Return the cache file for mesh_path and the source stamp it must match
+
+    The stamp covers the mesh and every material and texture file that
+    its references resolve to, wherever they live, so editing an MTL or
+    adding a missing texture also invalidates the entry.
+    """
+    mesh_path = os.path.abspath(mesh_path)
+    key = hashlib.blake2b(mesh_path.encode('utf-8'), digest_size=16).hexdigest()
+
+    stamp = hashlib.blake2b(digest_size=16)
+    for path in [mesh_path] + mesh_companion_files(mesh_path):
+        stat = os.stat(path)
+        stamp.update(f'{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n'.encode('utf-8'))
+    return os.path.join(CACHE_DIR, key + '.npz'), stamp.hexdigest()
+
+
+def _prune_cache():
+    """Remove the least recently used entries until CACHE_DIR fits CACHE_MAX_BYTES"""
+    entries = []
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith('.npz'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total_size = 0
+    for _, size, path in sorted(entries, reverse=True):
+        total_size += size
+        if total_size > CACHE_MAX_BYTES:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_cached_mesh(mesh_path):
+    """Return the cached TriangleMesh for mesh_path, or None on a miss
+
+    An entry only counts if the mesh and the files it references still
+    have the paths, modification times and sizes they had when the entry
+    was written.
+    """
+    try:
+        cache_path, stamp = _cache_entry(mesh_path)
+        if not os.path.exists(cache_path):
+            return None
+        with np.load(cache_path) as data:
+            if str(data['source_stamp']) != stamp:
+                return None
+            mesh = o3d.geometry.TriangleMesh()
+            for name, vector_type in _CACHED_MESH_FIELDS:
+                if name in data:
+                    setattr(mesh, name, vector_type(data[name]))
+            mesh.textures = [o3d.geometry.Image(np.ascontiguousarray(data[f'texture_{i}']))
+                             for i in range(int(data['texture_count']))]
+        # Mark the entry as recently used for _prune_cache()
+        os.utime(cache_path)
+        return mesh
+    except Exception:
+        # A missing, stale or unreadable entry just means parsing again
+        return None
+
+
+def store_cached_mesh(mesh_path, mesh):
+    """Write mesh to the cache as uncompressed arrays keyed by mesh_path"""
+    cache_path, stamp = _cache_entry(mesh_path)
+    arrays = {'source_stamp': np.array(stamp),
+              'texture_count': np.array(len(mesh.textures))}
+    for name, _ in _CACHED_MESH_FIELDS:
+        values = np.asarray(getattr(mesh, name))
+        if len(values):
+            arrays[name] = values
+    for i, texture in enumerate(mesh.textures):
+        arrays[f'texture_{i}'] = np.asarray(texture)
+
+    # Write to a temporary name first so readers never see a partial entry
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, cache_path)
+    _prune_cache()
@@ -2,9 +2,17 @@ import open3d as o3d
 import os
 import numpy as np
 
+from _mesh_io import (
+    find_texture_file, scan_obj_header, scan_mtl_textures, deduplicate_vertices
+)
 
-def comprehensive_mesh_analysis_and_load(obj_path):
-    """Comprehensive analysis and loading of 3D mesh with textures"""
+
+def comprehensive_mesh_analysis_and_load(obj_path, fast_load=True):
+    """Comprehensive analysis and loading of 3D mesh with textures
+
+    With fast_load the ASSIMP post-processing pipeline is skipped; the
+    only step we rely on (vertex normals) is computed below anyway.
+    """
 
     print("=== 3D Mesh Analysis and Loading ===")
     print(f"OBJ file: {obj_path}")
@@ -15,25 +23,17 @@ def comprehensive_mesh_analysis_and_load(obj_path):
     # 1. Analyze OBJ file structure
     print("\n1. Analyzing OBJ file structure...")
     has_mtl = False
-    has_texture_coords = False
     mtl_files = []
 
     try:
-        with open(obj_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('mtllib'):
-                    has_mtl = True
-                    mtl_file = line.split(' ', 1)[1]
-                    mtl_files.append(mtl_file)
-                    print(f"   Found material library: {mtl_file}")
-                elif line.startswith('vt'):
-                    has_texture_coords = True
+        mtl_files = scan_obj_header(obj_path)
+        for mtl_file in mtl_files:
+            print(f"   Found material library: {mtl_file}")
+        has_mtl = bool(mtl_files)
     except Exception as e:
         print(f"   Error reading OBJ file: {e}")
 
     print(f"   Has material library: {has_mtl}")
-    print(f"   Has texture coordinates: {has_texture_coords}")
 
     # 2. Analyze MTL file if it exists
     texture_files = []
@@ -44,13 +44,9 @@ def comprehensive_mesh_analysis_and_load(obj_path):
             if os.path.exists(mtl_path):
                 print(f"   Reading: {mtl_path}")
                 try:
-                    with open(mtl_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line.startswith('map_Kd'):
-                                texture_file = line.split(' ', 1)[1]
-                                texture_files.append(texture_file)
-                                print(f"   Found texture: {texture_file}")
+                    for texture_file in scan_mtl_textures(mtl_path):
+                        texture_files.append(texture_file)
+                        print(f"   Found texture: {texture_file}")
                 except Exception as e:
                     print(f"   Error reading MTL file: {e}")
             else:
@@ -61,38 +57,23 @@ def comprehensive_mesh_analysis_and_load(obj_path):
     if texture_files:
         print("\n3. Searching for texture files...")
         for texture_file in texture_files:
-            # Try different locations and extensions
-            possible_paths = [
-                os.path.join(obj_dir, texture_file),
-                os.path.join(obj_dir, os.path.basename(texture_file)),
-            ]
-
-            # Try different extensions
-            base_name = os.path.splitext(texture_file)[0]
-            extensions = ['.jpg', '.jpeg', '.png',
-                          '.bmp', '.tga', '.JPG', '.JPEG', '.PNG']
-            for ext in extensions:
-                possible_paths.append(os.path.join(obj_dir, base_name + ext))
-
-            for test_path in possible_paths:
-                if os.path.exists(test_path):
-                    found_texture_path = test_path
-                    print(f"   ✅ Found texture: {test_path}")
-                    break
-                else:
-                    print(f"   ❌ Not found: {test_path}")
-
+            found_texture_path = find_texture_file(obj_dir, texture_file)
             if found_texture_path:
+                print(f"   ✅ Found texture: {found_texture_path}")
                 break
+            print(f"   ❌ Not found: {texture_file}")
 
     # 4. Load the mesh
     print("\n4. Loading mesh...")
-    mesh = o3d.io.read_triangle_mesh(obj_path, enable_post_processing=True)
+    mesh = o3d.io.read_triangle_mesh(
+        obj_path, enable_post_processing=not fast_load)
+    deduplicate_vertices(mesh)
     mesh.compute_vertex_normals()
 
     # Display mesh info
     print(f"   Vertices: {len(mesh.vertices):,}")
     print(f"   Triangles: {len(mesh.triangles):,}")
+    print(f"   Has texture coordinates: {mesh.has_triangle_uvs()}")
     print(f"   Textures auto-loaded: {len(mesh.textures)}")
 
     # 5. Manual texture loading if needed
@@ -124,14 +105,10 @@ def comprehensive_mesh_analysis_and_load(obj_path):
                                           window_name="3D Mesh with Textures")
     else:
         print("   Displaying colored mesh")
-        # Create a colored mesh
-        colored_mesh = o3d.geometry.TriangleMesh()
-        colored_mesh.vertices = mesh.vertices
-        colored_mesh.triangles = mesh.triangles
-        colored_mesh.vertex_normals = mesh.vertex_normals
-        colored_mesh.paint_uniform_color([0.7, 0.5, 0.3])  # Skin tone
-
-        o3d.visualization.draw_geometries([colored_mesh],
+        # Color the mesh in place rather than copying its buffers
+        mesh.paint_uniform_color([0.7, 0.5, 0.3])  # Skin tone
+
+        o3d.visualization.draw_geometries([mesh],
                                           mesh_show_wireframe=False,
                                           mesh_show_back_face=False,
                                           window_name="3D Mesh (Colored)")
@@ -1,148 +1,80 @@
 import sys
 import os
 import webbrowser
-import shutil
-import tempfile
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QPushButton,
-    QFileDialog, QVBoxLayout, QLabel, QTextEdit, QHBoxLayout
-)
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtWidgets import QApplication, QFileDialog, QProgressBar
+from PyQt5.QtCore import QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 import open3d as o3d
 import numpy as np
 
+from _mesh_gui_base import MeshGUIBase
+from _mesh_io import (
+    is_remote_path, staged_copy, find_texture_file,
+    scan_obj_header, scan_mtl_textures, load_cached_mesh, store_cached_mesh,
+    deduplicate_vertices
+)
+
+
+class MeshLoadSignals(QObject):
+    """Signals emitted by MeshLoadTask (QRunnable is not a QObject)"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class MeshLoadTask(QRunnable):
+    """Run a mesh loader on the thread pool and report back via signals"""
+
+    def __init__(self, load, file_name):
+        super().__init__()
+        self.load = load
+        self.file_name = file_name
+        self.signals = MeshLoadSignals()
+
+    def run(self):
+        try:
+            mesh = self.load(self.file_name)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(mesh)
+
+
+class MeshGUI(MeshGUIBase):
+    window_title = "OBJ Mesh Viewer"
 
-class MeshGUI(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.setWindowFlags(Qt.FramelessWindowHint)  # Frameless window
-        self.setGeometry(100, 100, 1000, 700)
-
-        # Track mouse position for dragging the window
-        self.old_pos = None
-
-        # Central Widget
-        self.central_widget = QWidget()
-        self.central_widget.setStyleSheet("background-color: #2E3440;")
-        self.setCentralWidget(self.central_widget)
-
-        # Main layout
-        self.layout = QVBoxLayout()
-        self.layout.setSpacing(15)
-        self.central_widget.setLayout(self.layout)
-
-        # Custom title bar
-        self.title_bar = QWidget()
-        self.title_bar.setStyleSheet("background-color: #4C566A;")
-        self.title_layout = QHBoxLayout()
-        self.title_layout.setContentsMargins(0, 0, 0, 0)
-        self.title_bar.setLayout(self.title_layout)
-
-        # Title label centered
-        self.title_label = QLabel("OBJ Mesh Viewer")
-        self.title_label.setAlignment(Qt.AlignCenter)
-        self.title_label.setFont(QFont("Arial", 20, QFont.Bold))
-        self.title_label.setStyleSheet("color: white; padding: 10px;")
-        self.title_layout.addWidget(self.title_label)
-
-        # Close button
-        self.close_button = QPushButton("X")
-        self.close_button.setFixedSize(40, 30)
-        self.close_button.setStyleSheet("""
-            QPushButton {
-                background-color: #BF616A; 
-                color: white; 
-                font-weight: bold; 
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #D08770;
-            }
-        """)
-        self.close_button.clicked.connect(self.close)
-        self.title_layout.addWidget(self.close_button)
-
-        self.layout.addWidget(self.title_bar)
-
-        # Button styling
-        button_style = """
-            QPushButton {
-                background-color: #5E81AC;
-                color: white;
-                font-size: 16px;
-                padding: 10px;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #81A1C1;
-            }
-        """
 
+        # Open3D viewer; the window is created on first use and reused for
+        # later loads, with a ~60 Hz timer keeping it responsive
+        self._vis = None
+        self._vis_timer = QTimer(self)
+        self._vis_timer.setInterval(16)
+        self._vis_timer.timeout.connect(self._update_viewer)
+
+    def _add_action_buttons(self, layout):
         # Load OBJ button
-        self.load_button = QPushButton("Load OBJ File")
-        self.load_button.setStyleSheet(button_style)
-        self.load_button.clicked.connect(self.load_obj_mesh)
-        self.layout.addWidget(self.load_button)
+        self.load_button = self._add_button(layout, "Load OBJ File", self.load_obj_mesh)
 
         # Rig in Mixamo
-        self.rig_button = QPushButton("Rig in Mixamo")
-        self.rig_button.setStyleSheet(button_style)
-        self.rig_button.clicked.connect(self.open_mixamo)
-        self.layout.addWidget(self.rig_button)
-
-        # Status log
-        self.status_log = QTextEdit()
-        self.status_log.setReadOnly(True)
-        self.status_log.setStyleSheet(
-            "background-color: #3B4252; color: #ECEFF4; font-size: 14px; border-radius: 5px; padding: 5px;"
-        )
-        self.layout.addWidget(self.status_log)
-
-        # Mesh holder
-        self.mesh = None
-        self.mesh_file = None
-
-    # Make frameless window draggable
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.old_pos = event.globalPos()
-
-    def mouseMoveEvent(self, event):
-        if self.old_pos:
-            delta = QPoint(event.globalPos() - self.old_pos)
-            self.move(self.x() + delta.x(), self.y() + delta.y())
-            self.old_pos = event.globalPos()
-
-    def mouseReleaseEvent(self, event):
-        self.old_pos = None
-
-    def log(self, message):
-        self.status_log.append(message)
-        print(message)
-
-    def find_texture_file(self, obj_dir, texture_ref):
-        """Find texture file with various extensions and paths"""
-        # Try different locations and extensions
-        possible_paths = [
-            os.path.join(obj_dir, texture_ref),
-            os.path.join(obj_dir, os.path.basename(texture_ref)),
-        ]
-
-        # Try different extensions
-        base_name = os.path.splitext(texture_ref)[0]
-        extensions = ['.jpg', '.jpeg', '.png',
-                      '.bmp', '.tga', '.JPG', '.JPEG', '.PNG']
-        for ext in extensions:
-            possible_paths.append(os.path.join(obj_dir, base_name + ext))
-
-        for test_path in possible_paths:
-            if os.path.exists(test_path):
-                return test_path
-        return None
-
-    def load_obj_with_textures(self, obj_path):
-        """Enhanced OBJ loading with texture support"""
+        self.rig_button = self._add_button(layout, "Rig in Mixamo", self.open_mixamo)
+
+        # Busy indicator shown while a mesh loads in the background
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+    def closeEvent(self, event):
+        self._close_viewer()
+        super().closeEvent(event)
+
+    def load_obj_with_textures(self, obj_path, fast_load=True):
+        """Enhanced OBJ loading with texture support
+
+        With fast_load the ASSIMP post-processing pipeline is skipped; the
+        only step we rely on (vertex normals) is computed below anyway.
+        """
         self.log(f"Loading OBJ file: {obj_path}")
 
         if not os.path.exists(obj_path):
@@ -151,20 +83,14 @@ class MeshGUI(QMainWindow):
         # Get directory of OBJ file
         obj_dir = os.path.dirname(obj_path)
 
-        # Step 1: Analyze OBJ file for materials and texture coordinates
+        # Step 1: Analyze OBJ file for material libraries; texture
+        # coordinates are reported by mesh.has_triangle_uvs() after loading
         mtl_files = []
-        has_texture_coords = False
 
         try:
-            with open(obj_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('mtllib'):
-                        mtl_file = line.split(' ', 1)[1]
-                        mtl_files.append(mtl_file)
-                        self.log(f"Found material library: {mtl_file}")
-                    elif line.startswith('vt'):
-                        has_texture_coords = True
+            mtl_files = scan_obj_header(obj_path)
+            for mtl_file in mtl_files:
+                self.log(f"Found material library: {mtl_file}")
         except Exception as e:
             self.log(f"Warning: Could not analyze OBJ file structure: {e}")
 
@@ -175,20 +101,19 @@ class MeshGUI(QMainWindow):
                 mtl_path = os.path.join(obj_dir, mtl_file)
                 if os.path.exists(mtl_path):
                     try:
-                        with open(mtl_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            for line in f:
-                                line = line.strip()
-                                if line.startswith('map_Kd'):  # Diffuse texture map
-                                    texture_file = line.split(' ', 1)[1]
-                                    texture_paths.append(texture_file)
-                                    self.log(
-                                        f"Found texture reference: {texture_file}")
+                        # Diffuse texture maps
+                        for texture_file in scan_mtl_textures(mtl_path):
+                            texture_paths.append(texture_file)
+                            self.log(
+                                f"Found texture reference: {texture_file}")
                     except Exception as e:
                         self.log(f"Warning: Could not read MTL file: {e}")
 
         # Step 3: Load the mesh
         self.log("Loading 3D mesh...")
-        mesh = o3d.io.read_triangle_mesh(obj_path, enable_post_processing=True)
+        mesh = o3d.io.read_triangle_mesh(
+            obj_path, enable_post_processing=not fast_load)
+        deduplicate_vertices(mesh)
         mesh.compute_vertex_normals()
 
         self.log(
@@ -198,7 +123,7 @@ class MeshGUI(QMainWindow):
         if len(mesh.textures) == 0 and texture_paths:
             self.log("Textures not auto-loaded, attempting manual loading...")
             for texture_ref in texture_paths:
-                found_texture = self.find_texture_file(obj_dir, texture_ref)
+                found_texture = find_texture_file(obj_dir, texture_ref)
                 if found_texture:
                     try:
                         texture = o3d.io.read_image(found_texture)
@@ -222,6 +147,31 @@ class MeshGUI(QMainWindow):
 
         return mesh
 
+    def load_obj_file(self, file_name):
+        """Stage file_name locally if needed and load it; runs on the thread pool"""
+        # An OBJ whose mesh, MTL and texture files are all unchanged is served
+        # from the binary cache, textures included
+        mesh = load_cached_mesh(file_name)
+        if mesh is not None:
+            self.log(f"Loaded cached copy of unchanged OBJ: {file_name}")
+            return mesh
+
+        if is_remote_path(file_name):
+            # One sequential copy instead of many small network reads
+            self.log("OBJ is on a network drive, copying it locally first...")
+            with staged_copy(file_name) as local_file:
+                mesh = self.load_obj_with_textures(local_file)
+        else:
+            # Use enhanced OBJ loader
+            mesh = self.load_obj_with_textures(file_name)
+
+        if mesh.has_vertices():
+            try:
+                store_cached_mesh(file_name, mesh)
+            except Exception as e:
+                self.log(f"Warning: Could not cache mesh: {e}")
+        return mesh
+
     def load_obj_mesh(self):
         """Load and visualize OBJ file with textures"""
         file_name, _ = QFileDialog.getOpenFileName(
@@ -230,43 +180,69 @@ class MeshGUI(QMainWindow):
 
         if file_name:
             self.mesh_file = file_name
-            try:
-                # Use enhanced OBJ loader
-                self.mesh = self.load_obj_with_textures(file_name)
+            self.load_button.setEnabled(False)
+            self.progress_bar.show()
 
-                # Visualize the mesh
-                self.visualize_mesh(self.mesh)
+            # Load in the background so the window stays responsive
+            task = MeshLoadTask(self.load_obj_file, file_name)
+            task.signals.finished.connect(self.on_mesh_loaded)
+            task.signals.failed.connect(self.on_mesh_load_failed)
+            QThreadPool.globalInstance().start(task)
 
-            except Exception as e:
-                self.log(f"❌ Error loading OBJ file: {str(e)}")
+    def on_mesh_loaded(self, mesh):
+        self.mesh = mesh
+        self.progress_bar.hide()
+        self.load_button.setEnabled(True)
+
+        # Open3D windows are not thread-safe, so visualize on the GUI thread
+        self.visualize_mesh(self.mesh)
+
+    def on_mesh_load_failed(self, message):
+        self.progress_bar.hide()
+        self.load_button.setEnabled(True)
+        self.log(f"❌ Error loading OBJ file: {message}")
 
     def visualize_mesh(self, mesh):
         """Visualize mesh with proper texture handling"""
         try:
-            self.log("Opening 3D viewer...")
-
-            # Visualization options for better rendering
-            vis = o3d.visualization.Visualizer()
-            vis.create_window(window_name="OBJ Mesh Viewer",
-                              width=1200, height=800)
-
-            # Add the mesh to visualizer
-            vis.add_geometry(mesh)
-
-            # Set up camera and lighting for better visualization
-            vis.get_render_option().mesh_show_back_face = False
-            vis.get_render_option().mesh_show_wireframe = False
-            vis.get_render_option().light_on = True
-
-            # Run visualization
-            vis.run()
-            vis.destroy_window()
-
-            self.log("3D viewer closed")
+            if self._vis is None:
+                self.log("Opening 3D viewer...")
+                self._vis = o3d.visualization.Visualizer()
+                self._vis.create_window(window_name="OBJ Mesh Viewer",
+                                        width=1200, height=800)
+
+                # Set up camera and lighting for better visualization
+                render_option = self._vis.get_render_option()
+                render_option.mesh_show_back_face = False
+                render_option.mesh_show_wireframe = False
+                render_option.light_on = True
+
+                self._vis_timer.start()
+
+            # Swap the mesh in the existing window
+            self._vis.clear_geometries()
+            self._vis.add_geometry(mesh)
+            self._vis.reset_view_point(True)
+            self._vis.poll_events()
+            self._vis.update_renderer()
 
         except Exception as e:
             self.log(f"❌ Error in visualization: {str(e)}")
 
+    def _update_viewer(self):
+        # poll_events() returns False once the user has closed the window
+        if not self._vis.poll_events():
+            self._close_viewer()
+            self.log("3D viewer closed")
+            return
+        self._vis.update_renderer()
+
+    def _close_viewer(self):
+        self._vis_timer.stop()
+        if self._vis is not None:
+            self._vis.destroy_window()
+            self._vis = None
+
     # Open Mixamo website
     def open_mixamo(self):
         webbrowser.open("https://www.mixamo.com")